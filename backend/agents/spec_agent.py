@@ -1,38 +1,18 @@
+import asyncio
+import copy
+import functools
 import json
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, Tuple
 import openai
 import os
 import weave
 
-from tools.tool_registry import get_tool_names, instantiate_tool
+from tools.tool_registry import get_tool_names, get_tool_name_set, instantiate_tool
 
-class SpecAgent:
-    """
-    SpecAgent converts user prompts into CrewAI task specifications
-    """
-    
-    def __init__(self):
-        # Initialize OpenAI client (or use any LLM provider)
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.client = openai.OpenAI(api_key=api_key)
-        else:
-            self.client = None
-        self.tool_names = get_tool_names()
-    
-    @weave.op()
-    async def generate_crew_spec(self, prompt: str) -> Dict[str, Any]:
-        """
-        Takes a user prompt and converts it to a crew specification JSON
-        """
-        # Add weave attributes for better tracing - disabled
-        # with weave.attributes({
-        #     'prompt_length': len(prompt),
-        #     'available_tools': self.tool_names,
-        #     'has_openai_client': self.client is not None
-        # }):
-        available_tools = self.tool_names
-        system_prompt = f"""
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT_TEMPLATE = """
         You are a SpecAgent that converts user requests into CrewAI task specifications.
 
         You only have access to the following tools: {available_tools}
@@ -157,24 +137,95 @@ class SpecAgent:
         Always include relevant parameters in the params object.
         Respond with valid JSON only.
         """
+
+
+# The prompt only depends on the registered tools, so it is rendered once per process
+@functools.lru_cache(maxsize=None)
+def render_system_prompt(tool_names: Tuple[str, ...]) -> str:
+    # Rendered as a list so the names read like the JSON arrays the spec uses
+    return SYSTEM_PROMPT_TEMPLATE.format(available_tools=list(tool_names))
+
+
+@functools.lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> openai.OpenAI:
+    """Create one OpenAI client per API key so every SpecAgent shares its connection pool."""
+    return openai.OpenAI(api_key=api_key)
+
+
+class SpecAgent:
+    """
+    SpecAgent converts user prompts into CrewAI task specifications
+    """
+    
+    # Specs currently being generated, keyed by prompt and shared by every SpecAgent
+    _inflight_specs: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+    
+    def __init__(self):
+        # Initialize OpenAI client (or use any LLM provider)
+        api_key = os.getenv("OPENAI_API_KEY")
+        if api_key:
+            self.client = get_openai_client(api_key)
+        else:
+            self.client = None
+        self.tool_names = get_tool_names()
+        self.system_prompt = render_system_prompt(self.tool_names)
+    
+    @weave.op()
+    async def generate_crew_spec(self, prompt: str) -> Dict[str, Any]:
+        """
+        Takes a user prompt and converts it to a crew specification JSON.
+        Concurrent calls with the same prompt share a single LLM request.
+        """
+        while (pending := self._inflight_specs.get(prompt)) is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # Only the caller generating the spec was cancelled, not this one:
+                # take over (or join whoever did) instead of failing this run too
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_specs[prompt] = future
+        try:
+            crew_spec = await self._generate_crew_spec(prompt)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight_specs[prompt]
+        
+        # The future keeps the original; callers only ever see copies
+        future.set_result(crew_spec)
+        return copy.deepcopy(crew_spec)
+    
+    async def _generate_crew_spec(self, prompt: str) -> Dict[str, Any]:
+        # Add weave attributes for better tracing - disabled
+        # with weave.attributes({
+        #     'prompt_length': len(prompt),
+        #     'available_tools': self.tool_names,
+        #     'has_openai_client': self.client is not None
+        # }):
         
         try:
             # Use fallback if no OpenAI client
             if not self.client:
-                print('NO OPENAI CLIENT')
+                logger.debug("No OpenAI client configured, using fallback spec")
                 return self._get_fallback_spec(prompt)
                 
-            print("Making OpenAI API call...")
-            response = self.client.chat.completions.create(
+            logger.debug("Making OpenAI API call...")
+            # The OpenAI client is synchronous; keep it off the event loop
+            response = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model="gpt-4o-2024-08-06",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": self.system_prompt},
                     {"role": "user", "content": f"Convert this prompt to a crew specification: {prompt}"}
                 ],
             )
             
             content = response.choices[0].message.content
-            print(f"Raw API response: {content}")
+            logger.debug("Raw API response: %s", content)
             
             if content.startswith('```json'):
                 content = content[7:] 
@@ -184,11 +235,10 @@ class SpecAgent:
                 content = content[:-3]  
             content = content.strip()
             
-            print(f"Cleaned content: {content}")
+            logger.debug("Cleaned content: %s", content)
             crew_spec = json.loads(content)
 
-            print('CREW SPEC', crew_spec)
-            print('========================================')
+            logger.debug("Crew spec: %r", crew_spec)
             
             # Validate the structure
             if "tasks" not in crew_spec:
@@ -200,12 +250,12 @@ class SpecAgent:
             return crew_spec
             
         except json.JSONDecodeError as e:
-            print(f"JSON DECODE ERROR: {e}")
-            print(f"Raw content: {content}")
+            logger.warning("Failed to decode crew spec JSON: %s", e)
+            logger.debug("Raw content: %s", content)
             # Fallback to a default specification if LLM fails
             return self._get_fallback_spec(prompt)
         except Exception as e:
-            print(f"GENERAL EXCEPTION: {e}")
+            logger.warning("Crew spec generation failed: %s", e)
             # Fallback to a default specification if LLM fails
             return self._get_fallback_spec(prompt)
     
@@ -304,11 +354,13 @@ class SpecAgent:
             'screenshot': 'browserbase_tool',
         }
         
+        registered_tools = get_tool_name_set()
+        
         # Fix agent tool names
         for agent in crew_spec.get('agents', []):
             if 'tools' in agent:
                 agent['tools'] = [tool_mapping.get(tool, tool) for tool in agent['tools']]
                 # Remove any tools not in our registry
-                agent['tools'] = [tool for tool in agent['tools'] if tool in self.tool_names]
+                agent['tools'] = [tool for tool in agent['tools'] if tool in registered_tools]
         
         return crew_spec
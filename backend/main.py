@@ -2,7 +2,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import asyncio
-import json
+import orjson
+import logging
 import uuid
 from typing import Dict, Any
 import os
@@ -59,6 +60,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+logger = logging.getLogger(__name__)
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
@@ -76,9 +79,10 @@ class ConnectionManager:
         if run_id in self.active_connections:
             websocket = self.active_connections[run_id]
             try:
-                await websocket.send_text(json.dumps(message))
+                # Frontend parses text frames, so decode the orjson bytes
+                await websocket.send_text(orjson.dumps(message).decode())
             except Exception as e:
-                print(f"Error sending message to {run_id}: {e}")
+                logger.warning("Error sending message to %s: %s", run_id, e)
                 self.disconnect(run_id)
 
 manager = ConnectionManager()
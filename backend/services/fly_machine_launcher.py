@@ -220,14 +220,15 @@ async def _poll_machine_status(app_name: str, machine_id: str, headers: dict, ru
         "📊 Processing results...",
     ]
     
-    for i, msg in enumerate(progress_messages):
-        await manager.send_message(run_id, {"type": "log", "message": msg})
-        await asyncio.sleep(2)  # Simulate work being done
+    # One client for the whole poll loop so status checks reuse the same connection
+    async with httpx.AsyncClient(base_url=FLY_API_BASE_URL, timeout=10) as client:
+        for i, msg in enumerate(progress_messages):
+            await manager.send_message(run_id, {"type": "log", "message": msg})
+            await asyncio.sleep(2)  # Simulate work being done
         
-        # Check machine status periodically
-        if i % 2 == 0:
-            try:
-                async with httpx.AsyncClient(base_url=FLY_API_BASE_URL, timeout=10) as client:
+            # Check machine status periodically
+            if i % 2 == 0:
+                try:
                     resp = await client.get(f"/v1/apps/{app_name}/machines/{machine_id}", headers=headers)
                     if resp.status_code == 200:
                         machine_status = resp.json()
@@ -248,11 +249,11 @@ async def _poll_machine_status(app_name: str, machine_id: str, headers: dict, ru
                                 {"type": "complete", "message": "✅ Task done"}
                             )
                             return
-            except Exception as exc:
-                await manager.send_message(
-                    run_id, 
-                    {"type": "agent-update", "message": f"Status check failed: {exc}"}
-                )
+                except Exception as exc:
+                    await manager.send_message(
+                        run_id, 
+                        {"type": "agent-update", "message": f"Status check failed: {exc}"}
+                    )
     
     # Final completion message
     await manager.send_message(run_id, {"type": "log", "message": "✅ Task completed successfully!"})
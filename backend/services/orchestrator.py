@@ -1,51 +1,64 @@
 import asyncio
 import json
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from agents.spec_agent import SpecAgent
 from crewai import Crew, Agent, Task
 
 from tools.tool_registry import instantiate_tool
 
+# CrewAI's verbose mode writes every agent step to stdout; opt in with CREW_VERBOSE=1
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
+
+# Crew runs last minutes; keep them off the default executor used for short blocking calls.
+# At most CREW_MAX_WORKERS crews run at once; further runs queue until a worker frees up.
+CREW_MAX_WORKERS = int(os.getenv("CREW_MAX_WORKERS", "4"))
+CREW_EXECUTOR = ThreadPoolExecutor(max_workers=CREW_MAX_WORKERS, thread_name_prefix="crew")
+
+# Compiled once; format_result_for_markdown runs over the full crew output
+URL_PATTERN = re.compile(r'(https?://[^\s\)\]]+)')
+TRAILING_PUNCTUATION_PATTERN = re.compile(r'[.,;:!?)\]]*$')
+IMAGE_URL_PATTERN = re.compile(r'\.(jpg|jpeg|png|gif|webp|svg)(\?.*)?$', re.IGNORECASE)
+MARKDOWN_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\((https?://[^\s\)]+)\)')
+
 def format_result_for_markdown(result: str) -> str:
     """
     Format the result to ensure URLs are properly formatted as markdown links or images.
     This ensures that image URLs are rendered as images and other URLs as clickable links.
     """
-    # Enhanced regex to find URLs in various formats
-    url_pattern = r'(https?://[^\s\)\]]+)'
-    
     def replace_url(match):
         url = match.group(1)
         # Clean up URL by removing trailing punctuation that might not be part of URL
-        url = re.sub(r'[.,;:!?)\]]*$', '', url)
+        url = TRAILING_PUNCTUATION_PATTERN.sub('', url)
         
         # Check if it's likely an image URL
-        if re.search(r'\.(jpg|jpeg|png|gif|webp|svg)(\?.*)?$', url, re.IGNORECASE):
+        if IMAGE_URL_PATTERN.search(url):
             return f'![Generated Image]({url})'
         else:
             # For other URLs, create a clickable link
             return f'[{url}]({url})'
     
     # Replace URLs with markdown format
-    formatted = re.sub(url_pattern, replace_url, result)
+    formatted = URL_PATTERN.sub(replace_url, result)
     
     # Also handle markdown links that might already be in the result
     # Look for existing markdown link patterns: [text](url)
-    markdown_link_pattern = r'\[([^\]]+)\]\((https?://[^\s\)]+)\)'
-    
     def enhance_markdown_link(match):
         text = match.group(1)
         url = match.group(2)
         
         # If it's an image URL and the text suggests it's a link, convert to image
-        if re.search(r'\.(jpg|jpeg|png|gif|webp|svg)(\?.*)?$', url, re.IGNORECASE):
-            if 'here' in text.lower() or 'image' in text.lower() or 'view' in text.lower():
+        if IMAGE_URL_PATTERN.search(url):
+            lowered = text.lower()
+            if 'here' in lowered or 'image' in lowered or 'view' in lowered:
                 return f'![Generated Image]({url})'
         
         return match.group(0)  # Return original if no change needed
     
-    formatted = re.sub(markdown_link_pattern, enhance_markdown_link, formatted)
+    formatted = MARKDOWN_LINK_PATTERN.sub(enhance_markdown_link, formatted)
     
     return formatted
 
@@ -122,23 +135,23 @@ async def runCrew(prompt: str, run_id: str, manager):
         
         # Step 3: Send pipeline initialization data (only agents with tasks)
         agents_with_tasks = []
+        filtered_agent_ids: Dict[str, int] = {}
         pipeline_tasks = []
+        agent_positions = {id(agent): i for i, agent in enumerate(crew.agents)}
         
         for task_idx, task in enumerate(crew.tasks):
-            agent_idx = next((i for i, agent in enumerate(crew.agents) if agent == task.agent), 0)
-            agent = crew.agents[agent_idx]
+            agent = crew.agents[agent_positions.get(id(task.agent), 0)]
             
             # Only add agent if not already added
-            if not any(a["role"] == agent.role for a in agents_with_tasks):
+            filtered_agent_id = filtered_agent_ids.get(agent.role)
+            if filtered_agent_id is None:
+                filtered_agent_id = filtered_agent_ids[agent.role] = len(agents_with_tasks)
                 agents_with_tasks.append({
-                    "id": len(agents_with_tasks), 
+                    "id": filtered_agent_id, 
                     "role": agent.role, 
                     "status": "pending"
                 })
             
-            # Find the agent ID in our filtered list
-            filtered_agent_id = next((i for i, a in enumerate(agents_with_tasks) if a["role"] == agent.role), 0)
-            
             pipeline_tasks.append({
                 "id": task_idx, 
                 "description": task.description[:50] + "...", 
@@ -169,38 +182,55 @@ async def runCrew(prompt: str, run_id: str, manager):
                 "agent_id": i,
                 "agent_status": "ready"
             })
-            await asyncio.sleep(0.2)  # Small delay for visual effect
         
-        # Execute crew in thread pool to avoid blocking
-        import concurrent.futures
+        # Send start message
+        await manager.send_message(run_id, {
+            "type": "agent-update", 
+            "message": f"🚀 Starting crew with {len(agents_with_tasks)} agents and {len(crew.tasks)} tasks...",
+            "pipeline_status": "running"
+        })
         
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # Send start message
-            await manager.send_message(run_id, {
-                "type": "agent-update", 
-                "message": f"🚀 Starting crew with {len(agents_with_tasks)} agents and {len(crew.tasks)} tasks...",
-                "pipeline_status": "running"
-            })
-            
-            # Execute crew
-            future = executor.submit(crew.kickoff)
+        # Set by the worker thread when kickoff actually begins, so time spent
+        # waiting for a free executor worker doesn't count against the run
+        kickoff_started_at = []
+        
+        def run_kickoff():
+            kickoff_started_at.append(time.monotonic())
+            return crew.kickoff()
+        
+        # Execute crew on its own executor to avoid blocking the event loop
+        crew_task = asyncio.get_running_loop().run_in_executor(CREW_EXECUTOR, run_kickoff)
+        
+        # Send progress updates while waiting
+        queued_at = time.monotonic()
+        while True:
+            done, _ = await asyncio.wait({crew_task}, timeout=2)  # Check every 2 seconds
+            if done:
+                break
             
-            # Send progress updates while waiting
-            import time
-            start_time = time.time()
-            while not future.done():
-                await asyncio.sleep(2)  # Check every 2 seconds
-                elapsed = int(time.time() - start_time)
+            if not kickoff_started_at:
+                queued = int(time.monotonic() - queued_at)
                 await manager.send_message(run_id, {
                     "type": "log",
-                    "message": f"Still working... ({elapsed}s elapsed)"
+                    "message": f"⏳ Queued: waiting for a free crew worker... ({queued}s)"
                 })
                 
-                if elapsed > 300:  # 5 minute timeout
-                    future.cancel()
-                    raise Exception("Crew execution timeout")
+                if queued > 300:  # Give up before starting; cancel drops it from the queue
+                    crew_task.cancel()
+                    raise Exception("Crew queue timeout: all crew workers are busy")
+                continue
+            
+            elapsed = int(time.monotonic() - kickoff_started_at[0])
+            await manager.send_message(run_id, {
+                "type": "log",
+                "message": f"Still working... ({elapsed}s elapsed)"
+            })
             
-            result = future.result()
+            if elapsed > 300:  # 5 minute timeout
+                crew_task.cancel()
+                raise Exception("Crew execution timeout")
+        
+        result = crew_task.result()
         
         # Step 4: Send completion event
         # Format the result to ensure URLs are properly formatted as markdown
@@ -223,12 +253,23 @@ async def create_crew_from_spec(crew_spec: Dict[str, Any], run_id: str, manager)
     Creates a CrewAI Crew object from the generated specification
     """
     agents = []
+    agents_by_role: Dict[str, Agent] = {}
     tasks = []
 
+    agent_specs = crew_spec.get("agents", [])
+
+    # Instantiate each distinct tool once per run and share it between agents.
+    # Tool constructors may do network/SDK setup, so keep them off the event loop.
+    unique_tool_names = list(dict.fromkeys(
+        tool_name for agent_spec in agent_specs for tool_name in agent_spec.get("tools", [])
+    ))
+    tool_instances = await asyncio.gather(
+        *(asyncio.to_thread(instantiate_tool, tool_name) for tool_name in unique_tool_names)
+    )
+    tools_by_name = dict(zip(unique_tool_names, tool_instances))
+
     # Create agents based on spec
-    for agent_spec in crew_spec.get("agents", []):
-        agent_tools = [instantiate_tool(tool_name) for tool_name in agent_spec.get("tools", [])]
-        
+    for agent_spec in agent_specs:
         # Log which tools the agent is using
         tool_names = agent_spec.get("tools", [])
         await manager.send_message(run_id, {
@@ -240,55 +281,55 @@ async def create_crew_from_spec(crew_spec: Dict[str, Any], run_id: str, manager)
             role=agent_spec.get("name"),
             goal=agent_spec.get("role_description"),
             backstory=agent_spec.get("role_description"),
-            tools=agent_tools,
-            verbose=True
+            tools=[tools_by_name[tool_name] for tool_name in tool_names],
+            verbose=CREW_VERBOSE
         )
         agents.append(agent)
+        # First agent wins if the spec repeats a role
+        agents_by_role.setdefault(agent.role, agent)
 
     # Create tasks with completion callbacks
-    agents_with_tasks = []
+    loop = asyncio.get_running_loop()
+    filtered_agent_ids: Dict[str, int] = {}
     for task_idx, task_spec in enumerate(crew_spec.get("tasks", [])):
         agent_name = task_spec.get("agent")
 
-        agent = next((a for a in agents if a.role == agent_name), None)
+        agent = agents_by_role.get(agent_name)
 
         if agent:
             # Track agents with tasks for proper ID mapping
-            if not any(a["role"] == agent.role for a in agents_with_tasks):
-                agents_with_tasks.append({"role": agent.role, "agent_obj": agent})
+            filtered_agent_id = filtered_agent_ids.setdefault(agent.role, len(filtered_agent_ids))
             
-            # Get the filtered agent ID
-            filtered_agent_id = next((i for i, a in enumerate(agents_with_tasks) if a["role"] == agent.role), 0)
+            description = task_spec.get("description", "")
+            # Truncated once and shared by every message about this task
+            short_desc = description[:50] + "..."
             
             # Create task completion callback
-            def create_completion_callback(agent_role, task_desc, task_id, agent_id, run_id, manager):
+            def create_completion_callback(agent_role, short_desc, task_id, agent_id, run_id, manager):
                 def callback(task_output):
-                    # Schedule the async message sending
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(manager.send_message(run_id, {
+                    # Runs on the crew's worker thread; hand the send back to the server loop
+                    asyncio.run_coroutine_threadsafe(manager.send_message(run_id, {
                         "type": "agent-update",
-                        "message": f"✅ Agent '{agent_role}' completed: {task_desc[:50]}...",
+                        "message": f"✅ Agent '{agent_role}' completed: {short_desc}",
                         "agent_id": agent_id,
                         "task_id": task_id,
                         "agent_status": "completed",
                         "task_status": "completed"
-                    }))
-                    loop.close()
+                    }), loop)
                 return callback
 
             task = Task(
-                description=task_spec.get("description", ""),
+                description=description,
                 expected_output=task_spec.get("expected_output", "Task completion"),
                 agent=agent,
-                callback=create_completion_callback(agent.role, task_spec.get("description", ""), task_idx, filtered_agent_id, run_id, manager)
+                callback=create_completion_callback(agent.role, short_desc, task_idx, filtered_agent_id, run_id, manager)
             )
 
             tasks.append(task)
 
             await manager.send_message(run_id, {
                 "type": "agent-update",
-                "message": f"📝 Task created: {task.description[:50]}... (Agent: {agent.role})",
+                "message": f"📝 Task created: {short_desc} (Agent: {agent.role})",
                 "task_id": task_idx,
                 "agent_id": filtered_agent_id
             })
@@ -297,7 +338,7 @@ async def create_crew_from_spec(crew_spec: Dict[str, Any], run_id: str, manager)
     crew = Crew(
         agents=agents,
         tasks=tasks,
-        verbose=True
+        verbose=CREW_VERBOSE
     )
     
     return crew
\ No newline at end of file
@@ -5,15 +5,20 @@ Test script to verify browserbase wrapper works with CrewAI
 
 import sys
 import os
+import traceback
 sys.path.append('/Users/byrencheema/Coding/PersonalProjects/agentable/backend')
 
-from crewai import Agent, Task, Crew
-from tools.tool_registry import instantiate_tool
+# CrewAI's verbose step logging dominates kickoff time; opt in with CREW_VERBOSE=1
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
 
 def test_crew_integration():
     """Test the browserbase wrapper with CrewAI crew execution"""
     print("Testing browserbase wrapper with CrewAI...")
     
+    # Imported here so loading this module doesn't pull in CrewAI
+    from crewai import Agent, Task, Crew
+    from tools.tool_registry import instantiate_tool
+    
     try:
         # Create browserbase tool
         browserbase_tool = instantiate_tool("browserbase_tool")
@@ -25,7 +30,7 @@ def test_crew_integration():
             goal="Navigate websites and extract content",
             backstory="You are a web navigation specialist",
             tools=[browserbase_tool],
-            verbose=True
+            verbose=CREW_VERBOSE
         )
         print("✓ Created agent with browserbase tool")
         
@@ -41,7 +46,7 @@ def test_crew_integration():
         crew = Crew(
             agents=[agent],
             tasks=[task],
-            verbose=True
+            verbose=CREW_VERBOSE
         )
         print("✓ Created crew")
         
@@ -55,8 +60,8 @@ def test_crew_integration():
         
     except Exception as e:
         print(f"❌ Crew integration test failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.getenv("AGENTABLE_DEBUG"):
+            traceback.print_exc()
         return False
 
 if __name__ == "__main__":
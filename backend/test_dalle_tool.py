@@ -11,13 +11,13 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from tools.tool_registry import instantiate_tool, get_tool_names
-from agents.spec_agent import SpecAgent
-from crewai import Agent, Task, Crew
+# Set CREW_VERBOSE=1 to see CrewAI's step-by-step agent output
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
 
 async def test_dalle_tool_registry():
     """Test that the Dall-E tool is properly registered"""
     print("🔧 Testing Dall-E tool registration...")
+    from tools.tool_registry import instantiate_tool, get_tool_names
     
     # Check if dalle_tool is in the registry
     tool_names = get_tool_names()
@@ -42,6 +42,7 @@ async def test_dalle_tool_registry():
 async def test_spec_agent_with_image_prompt():
     """Test that SpecAgent can generate crew specs for image generation"""
     print("\n📋 Testing SpecAgent with image generation prompt...")
+    from agents.spec_agent import SpecAgent
     
     # Check if OpenAI API key is set
     if not os.getenv("OPENAI_API_KEY"):
@@ -77,6 +78,9 @@ async def test_manual_crew_with_dalle():
         print("⚠️  OPENAI_API_KEY not set, skipping crew execution test")
         return
     
+    from crewai import Agent, Task, Crew
+    from tools.tool_registry import instantiate_tool
+    
     try:
         # Create an agent with the Dall-E tool
         dalle_tool = instantiate_tool("dalle_tool")
@@ -86,7 +90,7 @@ async def test_manual_crew_with_dalle():
             goal="Generate beautiful images from text descriptions",
             backstory="You are a skilled digital artist who specializes in creating images from textual descriptions using AI tools.",
             tools=[dalle_tool],
-            verbose=True
+            verbose=CREW_VERBOSE
         )
         
         # Create a task for image generation
@@ -100,7 +104,7 @@ async def test_manual_crew_with_dalle():
         crew = Crew(
             agents=[image_creator],
             tasks=[image_task],
-            verbose=True
+            verbose=CREW_VERBOSE
         )
         
         print("✅ Crew created successfully!")
@@ -144,4 +148,10 @@ async def main():
         print("\n⚠️  Some tests failed. Check the output above.")
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main()) 
\ No newline at end of file
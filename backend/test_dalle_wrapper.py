@@ -5,6 +5,7 @@ Test script to verify DALL-E wrapper cleans up markdown output
 
 import sys
 import os
+import traceback
 sys.path.append('/Users/byrencheema/Coding/PersonalProjects/agentable/backend')
 
 from tools.dalle_wrapper import DalleWrapper
@@ -63,8 +64,8 @@ def test_tool_registry():
         
     except Exception as e:
         print(f"❌ Tool registry test failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if os.getenv("AGENTABLE_DEBUG"):
+            traceback.print_exc()
         return False
 
 if __name__ == "__main__":
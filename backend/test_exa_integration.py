@@ -5,13 +5,12 @@ Test script to verify EXA integration with CrewAI
 import os
 import sys
 import asyncio
-from agents.spec_agent import SpecAgent
-from tools.tool_registry import get_tool_names, instantiate_tool
 
 def test_tool_registration():
     """Test that EXA tools are properly registered"""
     print("Testing tool registration...")
-    tool_names = get_tool_names()
+    from tools.tool_registry import get_tool_name_set
+    tool_names = get_tool_name_set()
     
     expected_tools = ["exa_search_tool"]
     
@@ -27,6 +26,7 @@ def test_tool_registration():
 def test_tool_instantiation():
     """Test that EXA tools can be instantiated"""
     print("\nTesting tool instantiation...")
+    from tools.tool_registry import instantiate_tool
     
     try:
         exa_tool = instantiate_tool("exa_search_tool")
@@ -44,6 +44,8 @@ async def test_spec_agent_exa():
     # Test prompt that should trigger EXA usage
     prompt = "Find high-quality research papers about machine learning interpretability"
     
+    from agents.spec_agent import SpecAgent
+    
     try:
         spec_agent = SpecAgent()
         crew_spec = await spec_agent.generate_crew_spec(prompt)
@@ -93,18 +95,29 @@ async def main():
         ("SpecAgent Integration", test_spec_agent_exa),
     ]
     
-    results = []
-    
-    for test_name, test_func in tests:
+    async def run_test(test_name, test_func):
         print(f"Running {test_name}...")
         
         if asyncio.iscoroutinefunction(test_func):
-            result = await test_func()
-        else:
-            result = test_func()
+            return await test_func()
+        # Sync tests run in a worker thread so they overlap with the async ones
+        return await asyncio.to_thread(test_func)
+    
+    # The tests are independent, so run them concurrently
+    outcomes = await asyncio.gather(
+        *(run_test(test_name, test_func) for test_name, test_func in tests),
+        return_exceptions=True
+    )
+    print()
+    
+    results = []
+    
+    for (test_name, _), outcome in zip(tests, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"❌ {test_name} raised: {outcome}")
+            outcome = False
         
-        results.append((test_name, result))
-        print()
+        results.append((test_name, outcome))
     
     # Summary
     print("=" * 50)
@@ -133,5 +146,11 @@ async def main():
     return failed == 0
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     success = asyncio.run(main())
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -19,11 +19,15 @@ Prerequisites:
    CrewAI can access an LLM when agents perform their tasks.
 """
 
-import json
-from typing import List, Dict, Type
+import orjson
+import os
+from typing import Any, List, Dict, Type
 
 from crewai import Agent, Crew, Task
 
+# Same switch as the orchestrator uses for CrewAI's step logging
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
+
 
 TOOL_REGISTRY: Dict[str, Type] = {
     # "WebSearch": WebsiteSearchTool,  # Uncomment when crewai_tools is available
@@ -49,29 +53,34 @@ OUTPUT_JSON = """
 """
 
 
-def _instantiate_tools(tool_names: List[str]):
-    """Instantiate tools listed in *tool_names* using TOOL_REGISTRY."""
-    tools = []
+def _instantiate_tools(tool_names: List[str], tool_cache: Dict[str, Any]):
+    """Instantiate tools listed in *tool_names* using TOOL_REGISTRY.
+
+    Instances are kept in *tool_cache* so agents of the same crew share them.
+    """
+    # Validate the whole list up front so every unknown name is reported at once
+    missing = set(tool_names).difference(TOOL_REGISTRY)
+    if missing:
+        raise ValueError(
+            f"Tools {sorted(missing)} are not registered. Add them to TOOL_REGISTRY to use them."
+        )
     for name in tool_names:
-        tool_cls = TOOL_REGISTRY.get(name)
-        if tool_cls is None:
-            raise ValueError(
-                f"Tool '{name}' is not registered. Add it to TOOL_REGISTRY to use it."
-            )
-        tools.append(tool_cls())
-    return tools
+        if name not in tool_cache:
+            tool_cache[name] = TOOL_REGISTRY[name]()
+    return [tool_cache[name] for name in tool_names]
 
 
 def build_crew_from_json(json_spec: str) -> Crew:
     """Create Agent, Task, and Crew instances from a JSON definition."""
 
-    data = json.loads(json_spec)
+    data = orjson.loads(json_spec)
 
     agents: List[Agent] = []
+    tool_cache: Dict[str, Any] = {}
 
     for agent_cfg in data["agents"]:
         tool_names = agent_cfg.pop("tools", [])
-        tools = _instantiate_tools(tool_names)
+        tools = _instantiate_tools(tool_names, tool_cache)
 
         # Create the Agent with the resolved tools.
         agents.append(Agent(**agent_cfg, tools=tools))
@@ -88,7 +97,7 @@ def build_crew_from_json(json_spec: str) -> Crew:
             )
         )
 
-    crew = Crew(agents=agents, tasks=tasks, verbose=True)  # type: ignore
+    crew = Crew(agents=agents, tasks=tasks, verbose=CREW_VERBOSE)  # type: ignore
     return crew
 
 
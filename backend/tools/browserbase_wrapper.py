@@ -1,10 +1,34 @@
+import functools
 import tiktoken
 import re
 from typing import Optional
 from crewai_tools import BrowserbaseLoadTool
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from pydantic import Field
 
+# lxml's C parser is much faster than html.parser on large pages; use it when installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+STRIPPED_TAGS = frozenset(["script", "style", "nav", "header", "footer", "aside"])
+# In priority order: the first tag with matching content areas wins
+MAIN_CONTENT_TAGS = ("main", "article", "section", "div")
+JUNK_CLASS_PATTERN = re.compile(r"nav|menu|sidebar|ad|advertisement|cookie|popup", re.I)
+MAIN_CLASS_PATTERN = re.compile(r"content|main|article|post", re.I)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+ENCODING_MODEL = "gpt-4o-mini"
+
+
+@functools.lru_cache(maxsize=4)
+def get_encoding(model: str):
+    """Load the tiktoken encoding for *model* once and share it between wrappers."""
+    return tiktoken.encoding_for_model(model)
+
 
 class BrowserbaseWrapper(BrowserbaseLoadTool):
     """
@@ -24,7 +48,7 @@ class BrowserbaseWrapper(BrowserbaseLoadTool):
         )
         
         # Set our additional attributes
-        self.encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+        self.encoding = get_encoding(ENCODING_MODEL)
     
     def _count_tokens(self, text: str) -> int:
         """Count tokens in text using tiktoken."""
@@ -37,22 +61,41 @@ class BrowserbaseWrapper(BrowserbaseLoadTool):
     def _clean_html_content(self, html_content: str) -> str:
         """Clean and extract main content from HTML."""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, HTML_PARSER)
             
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                script.decompose()
+            # Classify every element in a single walk instead of one find_all per rule.
+            # Stripped subtrees are skipped, so nothing inside them counts as content.
+            to_strip = []
+            content_areas = {tag: [] for tag in MAIN_CONTENT_TAGS}
+            stack = [child for child in reversed(soup.contents) if isinstance(child, Tag)]
+            while stack:
+                element = stack.pop()
+                
+                # Remove script, style and page chrome elements
+                if element.name in STRIPPED_TAGS:
+                    to_strip.append(element)
+                    continue
+                
+                # Remove common navigation and advertisement elements
+                classes = " ".join(element.get("class") or ())
+                if classes and JUNK_CLASS_PATTERN.search(classes):
+                    to_strip.append(element)
+                    continue
+                
+                if element.name in content_areas and classes and MAIN_CLASS_PATTERN.search(classes):
+                    content_areas[element.name].append(element)
+                
+                # Children are pushed in reverse so elements pop in document order
+                stack.extend(child for child in reversed(element.contents) if isinstance(child, Tag))
             
-            # Remove common navigation and advertisement elements
-            for element in soup.find_all(attrs={"class": re.compile(r"nav|menu|sidebar|ad|advertisement|cookie|popup", re.I)}):
+            for element in to_strip:
                 element.decompose()
             
             # Extract main content areas first
             main_content = ""
-            for tag in ["main", "article", "section", "div"]:
-                content_areas = soup.find_all(tag, attrs={"class": re.compile(r"content|main|article|post", re.I)})
-                if content_areas:
-                    main_content = " ".join([area.get_text(strip=True) for area in content_areas])
+            for tag in MAIN_CONTENT_TAGS:
+                if content_areas[tag]:
+                    main_content = " ".join([area.get_text(strip=True) for area in content_areas[tag]])
                     break
             
             # If no main content found, get all text
@@ -60,40 +103,32 @@ class BrowserbaseWrapper(BrowserbaseLoadTool):
                 main_content = soup.get_text(strip=True)
             
             # Clean up whitespace
-            main_content = re.sub(r'\s+', ' ', main_content).strip()
+            main_content = ' '.join(main_content.split())
             
             return main_content
             
         except Exception:
             # Fallback to simple text extraction
-            return re.sub(r'<[^>]+>', '', html_content)
+            return TAG_PATTERN.sub('', html_content)
     
     def _truncate_content(self, content: str) -> str:
         """Truncate content to stay under token limit."""
-        token_count = self._count_tokens(content)
-        
-        if token_count <= self.max_tokens:
-            return content
-        
-        # Binary search for optimal truncation point
-        left, right = 0, len(content)
-        best_content = content[:self.max_tokens * 4]  # Rough fallback
-        
-        while left < right:
-            mid = (left + right + 1) // 2
-            candidate = content[:mid]
-            
-            if self._count_tokens(candidate) <= self.max_tokens:
-                best_content = candidate
-                left = mid
-            else:
-                right = mid - 1
+        try:
+            # Encode once and cut the token list instead of re-encoding prefixes
+            tokens = self.encoding.encode(content)
+        except Exception:
+            # Fallback to rough character-based estimation
+            if len(content) // 4 <= self.max_tokens:
+                return content
+            truncated = content[:self.max_tokens * 4]
+        else:
+            if len(tokens) <= self.max_tokens:
+                return content
+            # The cut can land inside a multi-byte character; drop the partial bytes
+            truncated = self.encoding.decode_bytes(tokens[:self.max_tokens]).decode("utf-8", "ignore")
         
         # Add truncation notice
-        if len(best_content) < len(content):
-            best_content += "\n\n[Content truncated due to size limits]"
-        
-        return best_content
+        return truncated + "\n\n[Content truncated due to size limits]"
     
     def _run(self, url: str, **kwargs) -> str:
         """Run the browserbase tool with content filtering."""
@@ -1,4 +1,3 @@
-import re
 from crewai_tools import DallETool
 from pydantic import Field
 
@@ -36,6 +35,6 @@ class DalleWrapper(DallETool):
         cleaned = output.replace('!Generated Image', '')
         
         # Clean up any extra whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = ' '.join(cleaned.split())
         
         return cleaned
\ No newline at end of file
@@ -1,21 +1,30 @@
-from crewai_tools import WebsiteSearchTool, SerperDevTool, CodeDocsSearchTool, DallETool, BrowserbaseLoadTool, EXASearchTool
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 import os
-from .browserbase_wrapper import BrowserbaseWrapper
+
+# crewai_tools loads every tool's dependencies on import, so it is only imported
+# when a tool is actually built. Listing names doesn't pay for it.
+# *defaults* are bound at registration; keyword arguments given at call time override them.
+def crewai_tool(class_name: str, **defaults):
+    def create_tool(**kwargs):
+        import crewai_tools
+        return getattr(crewai_tools, class_name)(**{**defaults, **kwargs})
+    return create_tool
 
 # Configure DallE tool with dall-e-3 model and input truncation
-def create_dalle_tool():
-    return DallETool(
-        model="dall-e-3",      # More reliable model
-        size="1024x1024",      # Standard size for dall-e-3
-        quality="standard",    # Use standard quality to keep costs lower
-        n=1                    # Generate 1 image (dall-e-3 only supports n=1)
-    )
+DALLE_KWARGS = MappingProxyType({
+    "model": "dall-e-3",      # More reliable model
+    "size": "1024x1024",      # Standard size for dall-e-3
+    "quality": "standard",    # Use standard quality to keep costs lower
+    "n": 1,                   # Generate 1 image (dall-e-3 only supports n=1)
+})
 
-# Configure Browserbase tool with API credentials and content filtering
-def create_browserbase_tool():
-    api_key = os.getenv("BROWSERBASE_API_KEY")
-    project_id = os.getenv("BROWSERBASE_PROJECT_ID")
+# Read once: a successful lookup is cached, a failed one raises and is retried next call
+@lru_cache(maxsize=1)
+def get_browserbase_credentials() -> tuple[str, str]:
+    api_key = os.environ.get("BROWSERBASE_API_KEY")
+    project_id = os.environ.get("BROWSERBASE_PROJECT_ID")
     
     if not api_key or not project_id:
         raise ValueError(
@@ -23,40 +32,54 @@ def create_browserbase_tool():
             "Get your credentials from https://browserbase.com/"
         )
     
+    return api_key, project_id
+
+# Configure Browserbase tool with API credentials and content filtering
+def create_browserbase_tool(**kwargs):
+    from .browserbase_wrapper import BrowserbaseWrapper
+    api_key, project_id = get_browserbase_credentials()
+    kwargs.setdefault("max_tokens", 150000)  # Safe limit under 200K TPM
+    
     return BrowserbaseWrapper(
         api_key=api_key,
         project_id=project_id,
-        max_tokens=150000  # Safe limit under 200K TPM
+        **kwargs
     )
 
-TOOL_REGISTRY = {
-    "website_search_tool": WebsiteSearchTool,
-    "serper_dev_tool": SerperDevTool,
-    "code_docs_search_tool": CodeDocsSearchTool,
-    "dalle_tool": create_dalle_tool,  # Add DallE tool
-    "browserbase_tool": BrowserbaseLoadTool,  # Add Browserbase navigation tool
-    "exa_search_tool": EXASearchTool,  # Add EXA semantic search tool
-}
+# Maps each tool name to the factory that builds it.
+# Read-only so the cached name lists below can't go stale.
+TOOL_REGISTRY = MappingProxyType({
+    "website_search_tool": crewai_tool("WebsiteSearchTool"),
+    "serper_dev_tool": crewai_tool("SerperDevTool"),
+    "code_docs_search_tool": crewai_tool("CodeDocsSearchTool"),
+    "dalle_tool": crewai_tool("DallETool", **DALLE_KWARGS),  # Add DallE tool
+    "browserbase_tool": create_browserbase_tool,  # Add Browserbase navigation tool
+    "exa_search_tool": crewai_tool("EXASearchTool"),  # Add EXA semantic search tool
+})
 
-def instantiate_tool(tool_name: str, **kwargs) -> Any:
-    if tool_name not in TOOL_REGISTRY:
-        raise KeyError(f"Tool '{tool_name}' not found in registry. Available tools: {list(TOOL_REGISTRY.keys())}")
-    
-    tool_class = TOOL_REGISTRY[tool_name]
-    
-    # Handle DallE tool specially since it's a function
-    if tool_name == "dalle_tool":
-        return tool_class()
+class ToolNotFoundError(KeyError):
+    """Raised for unregistered tool names. The message is only built when it's displayed."""
     
-    # Handle browserbase tool specially since it's a function
-    if tool_name == "browserbase_tool":
-        return create_browserbase_tool()
+    def __init__(self, tool_name: str):
+        super().__init__(tool_name)
+        self.tool_name = tool_name
     
-    # Handle EXA search tool - instantiate normally
-    if tool_name == "exa_search_tool":
-        return tool_class(**kwargs)
+    def __str__(self) -> str:
+        return f"Tool '{self.tool_name}' not found in registry. Available tools: {list(TOOL_REGISTRY)}"
+
+def instantiate_tool(tool_name: str, **kwargs) -> Any:
+    create_tool = TOOL_REGISTRY.get(tool_name)
+    if create_tool is None:
+        raise ToolNotFoundError(tool_name)
     
-    return tool_class(**kwargs)
+    return create_tool(**kwargs)
+
+# The registry is fixed at import time, so every caller shares one immutable tuple
+@lru_cache(maxsize=None)
+def get_tool_names() -> tuple[str, ...]:
+    return tuple(TOOL_REGISTRY)
 
-def get_tool_names() -> list[str]:
-    return list(TOOL_REGISTRY.keys())
\ No newline at end of file
+# Set form of get_tool_names() for membership checks
+@lru_cache(maxsize=None)
+def get_tool_name_set() -> frozenset[str]:
+    return frozenset(TOOL_REGISTRY)